@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
 from datetime import datetime, timezone
 from typing import Optional
 
+import orjson
+
 from core.config import settings
 from services.news_service import news_service
 from services.semantic_search import SemanticSearchService
@@ -9,35 +12,36 @@ from services.semantic_search import SemanticSearchService
 router = APIRouter()
 
 
-@router.get("/")
+# The root response never changes, so it is serialized once at import time
+_ROOT_PAYLOAD = orjson.dumps({
+    "message": settings.API_TITLE,
+    "status": "running",
+    "feed_source": "BBC Middle East",
+    "endpoints": {
+        "all_news": "/news",
+        "latest_news": "/news/latest/{count}",
+        "search_news": "/news/search/{keyword}",
+        "semantic_search": "/news/semantic/{query}",
+        "feed_status": "/news/status"
+    }
+})
+
+
+@router.get("/", response_model=None)
 async def read_root():
     """Root endpoint with basic API information."""
-    return {
-        "message": settings.API_TITLE,
-        "status": "running",
-        "feed_source": "BBC Middle East",
-        "endpoints": {
-            "all_news": "/news",
-            "latest_news": "/news/latest/{count}",
-            "search_news": "/news/search/{keyword}",
-            "semantic_search": "/news/semantic/{query}",
-            "feed_status": "/news/status"
-        }
-    }
+    return Response(content=_ROOT_PAYLOAD, media_type="application/json")
 
 
-@router.get("/news")
+@router.get("/news", response_model=None)
 async def get_all_news():
     """Get all stored news articles."""
-    articles = news_service.get_all_news()
-    return {
-        "total_articles": len(articles),
-        "articles": [item.to_dict() for item in articles]
-    }
+    payload = news_service.get_all_news_payload()
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/news/latest")
-@router.get("/news/latest/{count}")
+@router.get("/news/latest", response_model=None)
+@router.get("/news/latest/{count}", response_model=None)
 async def get_latest_news(count: int = settings.DEFAULT_ARTICLES_COUNT):
     """Get the latest N news articles."""
     if count <= 0:
@@ -52,33 +56,30 @@ async def get_latest_news(count: int = settings.DEFAULT_ARTICLES_COUNT):
             detail=f"Count cannot exceed {settings.MAX_ARTICLES_PER_REQUEST}"
         )
     
-    latest_items = news_service.get_latest_news(count)
-    return {
-        "requested_count": count,
-        "returned_count": len(latest_items),
-        "articles": [item.to_dict() for item in latest_items]
-    }
+    payload = news_service.get_latest_news_payload(count)
+    return Response(content=payload, media_type="application/json")
 
 
-@router.get("/news/search/{keyword}")
+@router.get("/news/search/{keyword}", response_model=None)
 async def search_news(keyword: str):
     """Search news articles by keyword in title or summary."""
-    if len(keyword.strip()) < settings.MIN_SEARCH_LENGTH:
+    needle = keyword.strip()
+    if len(needle) < settings.MIN_SEARCH_LENGTH:
         raise HTTPException(
             status_code=400,
             detail=f"Search keyword must be at least {settings.MIN_SEARCH_LENGTH} characters long"
         )
     
-    matching_articles = news_service.search_news(keyword)
+    matching_articles = news_service.search_news(needle)
     
-    return {
+    return ORJSONResponse(content={
         "keyword": keyword,
         "total_matches": len(matching_articles),
         "articles": [item.to_dict() for item in matching_articles]
-    }
+    })
 
 
-@router.get("/news/semantic/{query}")
+@router.get("/news/semantic/{query}", response_model=None)
 async def semantic_search(
     query: str,
     min_threshold: float = Query(0.5, ge=0.0, le=1.0),
@@ -116,7 +117,7 @@ async def semantic_search(
         max_results=max_results
     )
     
-    return {
+    return ORJSONResponse(content={
         "query": query,
         "parameters": {
             "min_threshold": min_threshold,
@@ -126,13 +127,14 @@ async def semantic_search(
         },
         "total_matches": len(results),
         "results": [result.to_dict() for result in results]
-    }
+    })
 
 
-@router.get("/news/status")
+@router.get("/news/status", response_model=None)
 async def get_feed_status():
     """Get RSS feed polling status and statistics."""
-    return news_service.get_feed_status()
+    payload = news_service.cached_payload("feed_status", news_service.get_feed_status)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.get("/health")
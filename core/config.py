@@ -1,6 +1,7 @@
 import numpy as np
 from numpy.typing import NDArray
 from sentence_transformers import SentenceTransformer
+from functools import cached_property
 from typing import Optional
 import os
 from dotenv import load_dotenv
@@ -28,6 +29,7 @@ class Settings:
     MIN_SEARCH_LENGTH: int = 2
     MAX_ARTICLES_PER_REQUEST: int = 50
     DEFAULT_ARTICLES_COUNT: int = 10
+    PRECOMPUTED_ARTICLE_COUNTS: tuple[int, ...] = (10, 20, 50)
     
     # Logging Configuration
     LOG_FORMAT: str = "[%(asctime)s] %(message)s"
@@ -36,30 +38,37 @@ class Settings:
     # User Interest Configuration
     USER_INTEREST_PROMPT: str = "Iran and Israel war news"
     EMBEDDING_MODEL_NAME: str = "all-MiniLM-L6-v2"
+    EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_CACHE_SIZE: int = 10_000
+    QUERY_EMBEDDING_CACHE_SIZE: int = 512
+    QUANTIZE_EMBEDDINGS: bool = False
     _model: Optional[SentenceTransformer] = None
     _user_interest_embedding: Optional[NDArray[np.float32]] = None
 
     # Telegram Configuration
     TELEGRAM_DATE_FORMAT: str = "%Y-%m-%d %H:%M:%S"
-    TELEGRAM_MESSAGE_TEMPLATE = {
-        'TITLE': "*{title}*",
-        'DATE': "📅 {date}",
-        'SUMMARY': "{summary}",
-        'SOURCE': "🔍 _{source}_",
-        'LINK': "🔗 {url}"
-    }
+    TELEGRAM_MESSAGE_INTERVAL_SECONDS: float = 1.0
+    TELEGRAM_MAX_SEND_RETRIES: int = 3
+    TELEGRAM_MESSAGE_TEMPLATE: str = (
+        "*{title}*\n"
+        "📅 {date}\n\n"
+        "{summary}\n\n"
+        "🔍 _{source}_\n"
+        "🔗 {url}"
+    )
 
-    @property
+    @cached_property
     def telegram_bot_token(self) -> str:
-        """Get the Telegram bot token from environment variables."""
+        """Get the Telegram bot token from environment variables, read once."""
         token = os.getenv("TELEGRAM_BOT_TOKEN")
         if not token:
             raise ValueError("TELEGRAM_BOT_TOKEN not found in environment variables")
         return token
 
-    @property
+    @cached_property
     def telegram_chat_id(self) -> str:
-        """Get the Telegram chat ID from environment variables."""
+        """Get the Telegram chat ID from environment variables, read once."""
         chat_id = os.getenv("TELEGRAM_CHAT_ID")
         if not chat_id:
             raise ValueError("TELEGRAM_CHAT_ID not found in environment variables")
@@ -75,10 +84,13 @@ class Settings:
 
     @property
     def user_interest_embedding(self) -> NDArray[np.float32]:
-        """Get the embedding for the user interest prompt."""
+        """Get the L2-normalized embedding for the user interest prompt."""
         if self._user_interest_embedding is None:
-            tensor = self.model.encode(self.USER_INTEREST_PROMPT)
-            self._user_interest_embedding = np.array(tensor, dtype=np.float32)
+            self._user_interest_embedding = self.model.encode(
+                self.USER_INTEREST_PROMPT,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
         return self._user_interest_embedding
 
 settings = Settings() 
@@ -1,6 +1,8 @@
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from api.routes import router
 from services.news_service import news_service
@@ -22,6 +24,8 @@ async def lifespan(app: FastAPI):
     """Manage application lifespan events."""
     # Startup
     logger.info(f"Starting {settings.API_TITLE}")
+    # Load the embedding model in a worker thread so the event loop never blocks on it
+    await asyncio.to_thread(lambda: settings.user_interest_embedding)
     await news_service.start_polling()
     
     yield
@@ -36,6 +40,7 @@ app = FastAPI(
     description=settings.API_DESCRIPTION,
     version=settings.API_VERSION,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc"
 )
@@ -1,11 +1,20 @@
+import base64
 import datetime as dt
+import re
 from dataclasses import dataclass, field
-from typing import Optional, Set
+from typing import FrozenSet, Optional, Set
 import numpy as np
 from numpy.typing import NDArray
 
+_WORD_RE = re.compile(r'\w+')
 
-@dataclass
+
+def word_set(text: Optional[str]) -> FrozenSet[str]:
+    """Get the set of lowercased words in a text."""
+    return frozenset(_WORD_RE.findall(text.lower())) if text else frozenset()
+
+
+@dataclass(slots=True)
 class FeedState:
     """
     Cache for a single RSS/Atom feed to track changes efficiently.
@@ -13,22 +22,33 @@ class FeedState:
     Tracks:
     - Content hash of latest article
     - Last successful fetch time
-    - Set of seen article IDs to prevent duplicates
+    - ETag and Last-Modified validators for conditional requests
+    - Set of 64-bit hashes of seen article IDs to prevent duplicates
     """
     
     latest_hash: Optional[str] = None 
     last_fetch_time: Optional[dt.datetime] = None
-    seen_ids: Set[str] = field(default_factory=set)
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    seen_ids: Set[int] = field(default_factory=set)
 
 
-@dataclass
+@dataclass(slots=True)
 class NewsItem:
     """
     Represents a single news article from the RSS feed.
     
     Contains all relevant information about a news article including
     metadata for API serialization and sentence transformer embeddings 
-    for semantic similarity matching.
+    for semantic similarity matching. The lowercased title and summary,
+    joined by a newline, are derived once at construction as
+    `search_text` for case-insensitive keyword search, and their
+    lowercased words as `title_words`/`summary_words` for exact word
+    matching in semantic search.
+    
+    `embedding` is always L2-normalized when set, so cosine similarity
+    against it is a plain dot product. An int8 embedding index replaces it
+    with `embedding_codes` and `embedding_scale`, dropping the float32 copy.
     """
     
     id: str
@@ -38,20 +58,50 @@ class NewsItem:
     summary: Optional[str] = None
     source: Optional[str] = None
     embedding: Optional[NDArray[np.float32]] = None
+    embedding_codes: Optional[NDArray[np.int8]] = field(default=None, init=False, repr=False, compare=False)
+    embedding_scale: float = field(default=0.0, init=False, repr=False, compare=False)
+    search_text: str = field(default="", init=False, repr=False, compare=False)
+    title_words: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    summary_words: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.search_text = f"{self.title or ''}\n{self.summary or ''}".lower()
+        self.title_words = word_set(self.title)
+        self.summary_words = word_set(self.summary)
 
-    def to_dict(self) -> dict:
+    def to_dict(self, include_embedding: bool = False) -> dict:
         """
         Convert NewsItem to dictionary for JSON serialization.
         
+        `published` is kept as a datetime; orjson serializes it natively.
+        The dictionary without the embedding is built once and reused on
+        later calls, so callers must not mutate it.
+        
+        Args:
+            include_embedding: Add the embedding as base64 of its raw
+                float32 bytes, dequantized if only int8 codes are kept
+        
         Returns:
-            dict: JSON-serializable dictionary representation
+            dict: orjson-serializable dictionary representation
         """
-        return {
-            "id": self.id,
-            "title": self.title,
-            "url": self.url,
-            "published": self.published.isoformat(),
-            "summary": self.summary,
-            "source": self.source,
-            "embedding": self.embedding.tolist() if self.embedding is not None else None
-        }
+        if self._dict is None:
+            self._dict = {
+                "id": self.id,
+                "title": self.title,
+                "url": self.url,
+                "published": self.published,
+                "summary": self.summary,
+                "source": self.source
+            }
+        if not include_embedding:
+            return self._dict
+        
+        vector = self.embedding
+        if vector is None and self.embedding_codes is not None:
+            vector = self.embedding_codes.astype(np.float32) * self.embedding_scale
+        
+        embedding = None
+        if vector is not None:
+            embedding = base64.b64encode(np.asarray(vector, dtype=np.float32).tobytes()).decode()
+        return {**self._dict, "embedding": embedding}
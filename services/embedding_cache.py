@@ -0,0 +1,54 @@
+from collections import OrderedDict
+import hashlib
+import threading
+from typing import Optional
+
+import numpy as np
+from numpy.typing import NDArray
+
+from core.config import settings
+
+
+class EmbeddingCache:
+    """
+    Bounded LRU cache of normalized text embeddings.
+
+    Entries are keyed by a 128-bit BLAKE2b digest of the text rather than
+    the text itself. The cache is read from worker threads as well as the
+    event loop, so access is guarded by a lock.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, NDArray[np.float32]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+    def get(self, text: str) -> Optional[NDArray[np.float32]]:
+        """Return the cached embedding of a text, or None."""
+        key = self._key(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+            return embedding
+
+    def put(self, text: str, embedding: NDArray[np.float32]) -> None:
+        """Cache the embedding of a text, evicting the least recently used."""
+        key = self._key(text)
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+
+embedding_cache = EmbeddingCache(max_size=settings.EMBEDDING_CACHE_SIZE)
+# User queries get their own cache so query traffic cannot evict article embeddings
+query_embedding_cache = EmbeddingCache(max_size=settings.QUERY_EMBEDDING_CACHE_SIZE)
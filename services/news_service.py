@@ -1,13 +1,17 @@
 import asyncio
-from typing import List, Optional
-from collections import deque
+import bisect
+from typing import Callable, Dict, Hashable, List, Optional, Set
+from collections import defaultdict
 import logging
 
+import httpx
+import orjson
+
 from core.config import settings
 from models.news import FeedState, NewsItem
 from models.semantic_search import SemanticSearchResult
 from services.rss_fetcher import fetch_feed
-from services.semantic_search import semantic_search_service
+from services.semantic_search import EmbeddingIndex, semantic_search_service
 from services.telegram_service import telegram_bot
 
 logging.basicConfig(
@@ -18,32 +22,67 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+def _newest_first(item: NewsItem) -> float:
+    """Sort key ordering articles by published date, newest first."""
+    return -item.published.timestamp()
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the set of 3-character substrings of a text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
 class NewsService:
     """
     Service class for managing news articles and RSS feed polling.
     
     Handles in-memory storage of news articles and provides methods
-    for retrieving, filtering, and managing news data.
+    for retrieving, filtering, and managing news data. The store is kept
+    sorted by published date (newest first), so reads never re-sort it.
     """
     
-    def __init__(self):
-        self.news_store: deque[NewsItem] = deque(maxlen=settings.MAX_STORED_ARTICLES)
+    def __init__(self, max_articles: int = settings.MAX_STORED_ARTICLES):
+        self.max_articles = max_articles
+        self.news_store: List[NewsItem] = []
+        self.news_by_id: Dict[str, NewsItem] = {}
+        self._trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        self.embedding_index = EmbeddingIndex(
+            capacity=max_articles,
+            dimension=settings.EMBEDDING_DIMENSION,
+            quantized=settings.QUANTIZE_EMBEDDINGS
+        )
         self.feed_state = FeedState()
+        # Shared across the polls of one run so the connection (and its TLS
+        # session) is kept alive; opened and closed with the polling task
+        self._client: Optional[httpx.AsyncClient] = None
         self._polling_task: Optional[asyncio.Task] = None
+        self._payload_cache: Dict[Hashable, bytes] = {}
+        self._status_snapshot: Optional[dict] = None
 
     async def start_polling(self) -> None:
         """Start the background RSS polling task."""
         if self._polling_task is None or self._polling_task.done():
+            if self._client is None or self._client.is_closed:
+                self._client = httpx.AsyncClient(
+                    timeout=settings.REQUEST_TIMEOUT_SECONDS,
+                    limits=httpx.Limits(max_keepalive_connections=10)
+                )
             self._polling_task = asyncio.create_task(self._rss_poller())
+            self._reset_caches()
     
     async def stop_polling(self) -> None:
-        """Stop the background RSS polling task."""
+        """Stop the background RSS polling task and close its HTTP client."""
         if self._polling_task and not self._polling_task.done():
             self._polling_task.cancel()
             try:
                 await self._polling_task
             except asyncio.CancelledError:
                 pass
+            self._reset_caches()
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def _rss_poller(self) -> None:
         """Background task that polls the RSS feed every configured interval."""
@@ -51,35 +90,127 @@ class NewsService:
         
         while True:
             try:
-                new_items = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, self.feed_state)
+                new_items = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, self.feed_state, self._client)
                 
                 if new_items:
                     logger.info(f"=== Processing {len(new_items)} new articles ===")
                     
                     for item in new_items:
-                        self.news_store.appendleft(item)
+                        self.add_item(item)
                         logger.info(f"[{item.published:%Y-%m-%d %H:%M}] {item.title}")
-                        
-                        # try:
-                        #     await telegram_bot.send_news(item)
-                        # except Exception as e:
-                        #     logger.error(f"Failed to send article to Telegram: {e}")
-                                        
-                    if len(self.news_store) > settings.MAX_STORED_ARTICLES:
-                        logger.info(f"Trimming to {settings.MAX_STORED_ARTICLES} articles")
-                        self.news_store = deque(
-                            list(self.news_store)[:settings.MAX_STORED_ARTICLES], 
-                            maxlen=settings.MAX_STORED_ARTICLES
-                        )
+                    
+                    # await telegram_bot.send_news_batch(new_items)
                 
             except Exception as e:
                 logger.error(f"RSS poller error: {e}")
             
+            self._reset_caches()
+            self._precompute_payloads()
             await asyncio.sleep(settings.POLL_INTERVAL_SECONDS)
     
+    def add_item(self, item: NewsItem) -> None:
+        """
+        Store a news article and index it for keyword search.
+        
+        Once the store is full, the oldest article is evicted; an article
+        older than everything in a full store is not stored at all.
+        Articles that are already stored are ignored.
+        """
+        if item.id in self.news_by_id:
+            return
+        
+        if len(self.news_store) >= self.max_articles:
+            if _newest_first(item) >= _newest_first(self.news_store[-1]):
+                return
+            self._unindex_item(self.news_store.pop())
+        
+        bisect.insort(self.news_store, item, key=_newest_first)
+        self._reset_caches()
+        
+        self.news_by_id[item.id] = item
+        for trigram in self._item_trigrams(item):
+            self._trigram_index[trigram].add(item.id)
+        
+        if item.embedding is not None:
+            self.embedding_index.add(item)
+    
+    def _unindex_item(self, item: NewsItem) -> None:
+        """Remove an evicted article from the lookup and search indexes."""
+        if self.news_by_id.get(item.id) is not item:
+            return
+        
+        del self.news_by_id[item.id]
+        self.embedding_index.remove(item)
+        
+        for trigram in self._item_trigrams(item):
+            postings = self._trigram_index.get(trigram)
+            if postings is not None:
+                postings.discard(item.id)
+                if not postings:
+                    del self._trigram_index[trigram]
+    
+    @staticmethod
+    def _item_trigrams(item: NewsItem) -> Set[str]:
+        """Get the trigrams of an article's search text."""
+        return _trigrams(item.search_text)
+    
+    def _reset_caches(self) -> None:
+        """Drop cached payloads and the feed status snapshot."""
+        self._payload_cache.clear()
+        self._status_snapshot = None
+    
+    def cached_payload(self, key: Hashable, build: Callable[[], dict]) -> bytes:
+        """
+        Get a serialized response payload, building it on first use.
+        
+        Payloads are kept until the end of the current poll cycle, since
+        the stored articles and feed state only change inside the poller.
+        
+        Args:
+            key: Cache key identifying the payload (e.g. endpoint and params)
+            build: Callable returning the payload to serialize on a miss
+            
+        Returns:
+            JSON-encoded payload
+        """
+        payload = self._payload_cache.get(key)
+        if payload is None:
+            payload = orjson.dumps(build())
+            self._payload_cache[key] = payload
+        return payload
+    
+    def _precompute_payloads(self) -> None:
+        """Serialize the most requested payloads right after a poll cycle."""
+        self.get_all_news_payload()
+        for count in settings.PRECOMPUTED_ARTICLE_COUNTS:
+            self.get_latest_news_payload(count)
+    
+    def get_all_news_payload(self) -> bytes:
+        """Get the serialized response for all stored news articles."""
+        def build() -> dict:
+            articles = self.get_all_news()
+            return {
+                "total_articles": len(articles),
+                "articles": [item.to_dict() for item in articles]
+            }
+        
+        return self.cached_payload("all_news", build)
+    
+    def get_latest_news_payload(self, count: int) -> bytes:
+        """Get the serialized response for the latest N news articles."""
+        def build() -> dict:
+            latest_items = self.get_latest_news(count)
+            return {
+                "requested_count": count,
+                "returned_count": len(latest_items),
+                "articles": [item.to_dict() for item in latest_items]
+            }
+        
+        return self.cached_payload(("latest_news", count), build)
+    
     def get_all_news(self) -> List[NewsItem]:
         """Get all stored news articles sorted by published date (newest first)."""
-        return sorted(self.news_store, key=lambda x: x.published, reverse=True)
+        return list(self.news_store)
     
     def get_latest_news(self, count: int = 10) -> List[NewsItem]:
         """
@@ -91,21 +222,38 @@ class NewsService:
         Returns:
             List of latest NewsItem objects sorted by published date (newest first)
         """
-        sorted_news = sorted(self.news_store, key=lambda x: x.published, reverse=True)
-        return sorted_news[:min(count, len(sorted_news))]
+        return self.news_store[:count]
     
     def search_news(self, keyword: str) -> List[NewsItem]:
         """
         Search news articles by keyword in title or summary.
         Results are sorted by published date (newest first).
+        
+        Keywords of three or more characters are first narrowed down with
+        the trigram index: an article can only contain the keyword if it
+        contains every trigram of it. Candidates are then checked with a
+        plain substring match.
         """
         keyword_lower = keyword.lower()
-        matching_items = [
-            item for item in self.news_store
-            if (item.title and keyword_lower in item.title.lower()) or 
-               (item.summary and keyword_lower in item.summary.lower())
+        keyword_trigrams = _trigrams(keyword_lower)
+        
+        if keyword_trigrams:
+            postings = sorted(
+                (self._trigram_index.get(trigram, set()) for trigram in keyword_trigrams),
+                key=len
+            )
+            candidate_ids = postings[0].intersection(*postings[1:])
+            candidates = sorted(
+                (self.news_by_id[item_id] for item_id in candidate_ids if item_id in self.news_by_id),
+                key=_newest_first
+            )
+        else:
+            candidates = self.news_store
+        
+        return [
+            item for item in candidates
+            if keyword_lower in item.search_text
         ]
-        return sorted(matching_items, key=lambda x: x.published, reverse=True)
 
     def semantic_search(
         self, 
@@ -120,7 +268,7 @@ class NewsService:
         """
         return semantic_search_service.search(
             query=query,
-            articles=list(self.news_store),
+            index=self.embedding_index,
             min_threshold=min_threshold,
             title_weight=title_weight,
             summary_weight=summary_weight,
@@ -131,20 +279,26 @@ class NewsService:
         """
         Get RSS feed polling status and statistics.
         
+        The status is built once and shared until an article is stored,
+        a poll cycle ends or polling is started or stopped, so callers
+        must not mutate it.
+        
         Returns:
             Dictionary with feed statistics and status
         """
-        sorted_news = sorted(self.news_store, key=lambda x: x.published, reverse=True) if self.news_store else []
-        
-        return {
-            "feed_url": settings.BBC_MIDDLE_EAST_RSS,
-            "total_articles_stored": len(self.news_store),
-            "unique_articles_seen": len(self.feed_state.seen_ids),
-            "latest_content_hash": self.feed_state.latest_hash,
-            "last_fetch_time": self.feed_state.last_fetch_time.isoformat() if self.feed_state.last_fetch_time else None,
-            "latest_article": sorted_news[0].to_dict() if sorted_news else None,
-            "polling_active": self._polling_task is not None and not self._polling_task.done(),
-        }
+        if self._status_snapshot is None:
+            latest = self.news_store[0] if self.news_store else None
+            
+            self._status_snapshot = {
+                "feed_url": settings.BBC_MIDDLE_EAST_RSS,
+                "total_articles_stored": len(self.news_store),
+                "unique_articles_seen": len(self.feed_state.seen_ids),
+                "latest_content_hash": self.feed_state.latest_hash,
+                "last_fetch_time": self.feed_state.last_fetch_time,
+                "latest_article": latest.to_dict() if latest else None,
+                "polling_active": self._polling_task is not None and not self._polling_task.done(),
+            }
+        return self._status_snapshot
 
 
 news_service = NewsService() 
@@ -0,0 +1,25 @@
+import numpy as np
+from numba import njit, prange
+from numpy.typing import NDArray
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def int8_similarities(
+    codes: NDArray[np.int8],
+    scales: NDArray[np.float32],
+    query_codes: NDArray[np.int8],
+    query_scale: float,
+    out: NDArray[np.float32]
+) -> None:
+    """
+    Score int8-quantized rows against an int8-quantized query.
+    
+    Each dot product is accumulated in integers and rescaled with the row
+    and query scales. Rows are scored in parallel and written to `out`.
+    """
+    n, d = codes.shape
+    for i in prange(n):
+        acc = 0
+        for k in range(d):
+            acc += np.int32(codes[i, k]) * np.int32(query_codes[k])
+        out[i] = acc * scales[i] * query_scale
@@ -1,16 +1,137 @@
-from typing import List, Optional
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
 import numpy as np
-from sklearn.preprocessing import normalize
+from numpy.typing import NDArray
 import logging
-import re
 
 from core.config import settings
-from models.news import NewsItem
+from models.news import NewsItem, word_set
 from models.semantic_search import MatchConfidence, SemanticSearchResult
+from services.embedding_cache import query_embedding_cache
 
 logger = logging.getLogger(__name__)
 
 
+def _unit(vector: NDArray[np.float32]) -> NDArray[np.float32]:
+    """Scale a vector to unit L2 norm."""
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector * (1.0 / np.sqrt(np.vdot(vector, vector)))
+
+
+def quantize(vectors: NDArray[np.float32]) -> Tuple[NDArray[np.int8], NDArray[np.float32]]:
+    """
+    Symmetrically quantize vectors to int8 with one scale per vector.
+    
+    Returns:
+        Tuple of the int8 codes and the scales that map them back to floats
+    """
+    scales = np.abs(vectors).max(axis=-1) / 127
+    safe_scales = np.where(scales > 0, scales, 1.0)[..., np.newaxis]
+    codes = np.round(vectors / safe_scales).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+class EmbeddingIndex:
+    """
+    Fixed-capacity matrix of L2-normalized article embeddings.
+    
+    Embeddings must already be unit length (see `NewsItem.embedding`), so a
+    row's dot product with a normalized query is its cosine similarity.
+    
+    Each embedded article owns one row; rows of evicted articles are reused.
+    In float32 mode the article's `embedding` is replaced by a view of its
+    row, so the article holds no vector of its own (the embedding cache
+    keeps a separate copy per text).
+    With `quantized=True` rows are stored as int8 with a per-row scale,
+    which takes a quarter of the float32 memory at a small precision cost;
+    the article's float32 `embedding` is dropped in favour of a view of its
+    int8 row (`embedding_codes`) and its scale.
+    NumPy has no BLAS path for integer matrices, so quantized rows are
+    scored with a Numba kernel instead.
+    """
+    
+    def __init__(self, capacity: int, dimension: int, quantized: bool = False):
+        self.quantized = quantized
+        if quantized:
+            # Numba is only loaded when int8 storage is actually used
+            from services.scoring import int8_similarities
+            self._int8_similarities = int8_similarities
+            
+            self._codes = np.zeros((capacity, dimension), dtype=np.int8)
+            self._scales = np.zeros(capacity, dtype=np.float32)
+            # Compile the scoring kernel now rather than on the first query
+            int8_similarities(
+                self._codes[:1], self._scales[:1], self._codes[0], 1.0,
+                np.empty(1, dtype=np.float32)
+            )
+        else:
+            self._vectors = np.zeros((capacity, dimension), dtype=np.float32)
+        
+        self._items: List[Optional[NewsItem]] = [None] * capacity
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._rows_used = 0
+    
+    @property
+    def items(self) -> Sequence[Optional[NewsItem]]:
+        """Articles by row, None for unused rows."""
+        return self._items[:self._rows_used]
+    
+    def add(self, item: NewsItem) -> None:
+        """Store an article's already normalized embedding."""
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = self._rows_used
+            self._rows_used += 1
+        
+        vector = np.asarray(item.embedding, dtype=np.float32)
+        
+        if self.quantized:
+            self._codes[row], self._scales[row] = quantize(vector)
+            item.embedding_codes = self._codes[row]
+            item.embedding_scale = float(self._scales[row])
+            item.embedding = None
+        else:
+            self._vectors[row] = vector
+            item.embedding = self._vectors[row]
+        
+        self._items[row] = item
+        self._rows[item.id] = row
+    
+    def remove(self, item: NewsItem) -> None:
+        """Release the row of an article, if it has one."""
+        row = self._rows.pop(item.id, None)
+        if row is None:
+            return
+        
+        if self.quantized:
+            # The row is about to be reused; give the article its own copy
+            item.embedding_codes = self._codes[row].copy()
+            self._codes[row] = 0
+            self._scales[row] = 0.0
+        else:
+            # The row is about to be reused; give the article its own copy
+            item.embedding = self._vectors[row].copy()
+            self._vectors[row] = 0.0
+        self._items[row] = None
+        self._free_rows.append(row)
+    
+    def similarities(self, query_embedding: NDArray[np.float32]) -> NDArray[np.float32]:
+        """
+        Cosine similarity of a normalized query embedding to every row.
+        
+        Unused rows score 0.
+        """
+        n = self._rows_used
+        if not self.quantized:
+            return self._vectors[:n] @ query_embedding
+        
+        query_codes, query_scale = quantize(query_embedding)
+        scores = np.empty(n, dtype=np.float32)
+        self._int8_similarities(self._codes[:n], self._scales[:n], query_codes, float(query_scale), scores)
+        return scores
+
+
 class SemanticSearchService:
     TITLE_WEIGHT: float = 0.7
     SUMMARY_WEIGHT: float = 0.3
@@ -23,22 +144,29 @@ class SemanticSearchService:
             0.6: MatchConfidence.POSSIBLE,
             0.0: MatchConfidence.WEAK
         }
+        ordered_thresholds = sorted(self.confidence_thresholds.items())
+        self._confidence_bounds = np.array([threshold for threshold, _ in ordered_thresholds])
+        self._confidence_levels = [level for _, level in ordered_thresholds]
     
-    def _calculate_exact_match_score(self, query: str, title: Optional[str], summary: Optional[str]) -> float:
+    def _calculate_exact_match_score(self, query_words: FrozenSet[str], item: NewsItem) -> float:
         """Calculate exact match score based on word presence."""
-        query_words = set(re.findall(r'\w+', query.lower()))
-        title_words = set(re.findall(r'\w+', title.lower() if title else ""))
-        summary_words = set(re.findall(r'\w+', summary.lower() if summary else ""))
-        
-        title_matches = len(query_words & title_words) / len(query_words) if query_words else 0
-        summary_matches = len(query_words & summary_words) / len(query_words) if query_words else 0
+        title_matches = len(query_words & item.title_words) / len(query_words) if query_words else 0
+        summary_matches = len(query_words & item.summary_words) / len(query_words) if query_words else 0
         
         return (title_matches * self.TITLE_WEIGHT + summary_matches * self.SUMMARY_WEIGHT)
     
+    def _encode_query(self, query: str) -> NDArray[np.float32]:
+        """Get the normalized query embedding, encoding only on a cache miss."""
+        query_embedding = query_embedding_cache.get(query)
+        if query_embedding is None:
+            query_embedding = _unit(settings.model.encode(query))
+            query_embedding_cache.put(query, query_embedding)
+        return query_embedding
+    
     def search(
         self,
         query: str,
-        articles: List[NewsItem],
+        index: EmbeddingIndex,
         min_threshold: float = 0.5,
         title_weight: Optional[float] = None,
         summary_weight: Optional[float] = None,
@@ -46,6 +174,10 @@ class SemanticSearchService:
     ) -> List[SemanticSearchResult]:
         """
         Search articles using a combination of semantic similarity and exact word matching.
+        
+        All semantic similarities are computed with a single matrix-vector
+        product over the embedding index; exact word matching only runs for
+        articles that can still reach `min_threshold`.
         """
         t_weight = title_weight if title_weight is not None else self.TITLE_WEIGHT
         s_weight = summary_weight if summary_weight is not None else self.SUMMARY_WEIGHT
@@ -54,58 +186,67 @@ class SemanticSearchService:
         t_weight = t_weight / total_weight
         s_weight = s_weight / total_weight
         
-        query_embedding = settings.model.encode(query)
-        query_embedding = np.array(query_embedding)
-        query_embedding = normalize(query_embedding.reshape(1, -1))[0]
+        query_embedding = self._encode_query(query)
+        query_words = word_set(query)
         
-        results: List[SemanticSearchResult] = []
+        similarities = index.similarities(query_embedding)
+        articles = index.items
+        
+        # The exact match score is at most 1, so it can raise the semantic
+        # similarity by at most EXACT_MATCH_BOOST
+        candidate_rows = np.flatnonzero(similarities >= min_threshold - self.EXACT_MATCH_BOOST)
         
-        for item in articles:
-            if item.embedding is None:
+        rows: List[int] = []
+        exact_match_scores: List[float] = []
+        
+        for row in candidate_rows:
+            item = articles[row]
+            if item is None:
                 continue
-                
-            article_embedding = np.array(item.embedding)
-            article_embedding = normalize(article_embedding.reshape(1, -1))[0]
-            semantic_similarity = np.dot(query_embedding, article_embedding)
             
-            exact_match_score = self._calculate_exact_match_score(
-                query, 
-                item.title, 
-                item.summary
-            )
+            rows.append(row)
+            exact_match_scores.append(self._calculate_exact_match_score(query_words, item))
+        
+        semantic_similarities = similarities[rows]
+        exact_match_array = np.array(exact_match_scores, dtype=np.float32)
+        combined_scores = np.maximum(
+            semantic_similarities,
+            semantic_similarities + (exact_match_array * self.EXACT_MATCH_BOOST)
+        )
+        
+        # Select the top matches in O(N), then sort only those
+        matches = np.flatnonzero(combined_scores >= min_threshold)
+        k = min(max_results, matches.size)
+        if k == 0:
+            return []
+        top = matches[np.argpartition(-combined_scores[matches], k - 1)[:k]]
+        top = top[np.argsort(-combined_scores[top], kind="stable")]
+        
+        # Bucket all returned scores into confidence levels at once
+        confidence_indices = np.digitize(combined_scores[top], self._confidence_bounds) - 1
+        
+        results: List[SemanticSearchResult] = []
+        
+        for i, confidence_index in zip(top, confidence_indices):
+            item = articles[rows[i]]
+            combined_score = combined_scores[i]
+            confidence = self._confidence_levels[confidence_index]
             
-            combined_score = max(
-                semantic_similarity,
-                semantic_similarity + (exact_match_score * self.EXACT_MATCH_BOOST)
-            )
+            results.append(SemanticSearchResult(
+                news_item=item,
+                similarity_score=combined_score,
+                confidence=confidence
+            ))
             
-            if combined_score >= min_threshold:
-                confidence = next(
-                    level for threshold, level in sorted(
-                        self.confidence_thresholds.items(),
-                        key=lambda x: x[0],
-                        reverse=True
-                    )
-                    if combined_score >= threshold
-                )
-                
-                results.append(SemanticSearchResult(
-                    news_item=item,
-                    similarity_score=combined_score,
-                    confidence=confidence
-                ))
-                
-                logger.info(
-                    f"Match scores - Semantic: {semantic_similarity:.3f}, "
-                    f"Exact: {exact_match_score:.3f}, Combined: {combined_score:.3f}\n"
-                    f"Query: {query}\n"
-                    f"Title: {item.title}\n"
-                    f"Summary: {item.summary}\n"
-                    f"---"
-                )
-        
-        results.sort(key=lambda x: x.similarity_score, reverse=True)
-        return results[:max_results]
-
+            logger.info(
+                f"Match scores - Semantic: {semantic_similarities[i]:.3f}, "
+                f"Exact: {exact_match_scores[i]:.3f}, Combined: {combined_score:.3f}\n"
+                f"Query: {query}\n"
+                f"Title: {item.title}\n"
+                f"Summary: {item.summary}\n"
+                f"---"
+            )
+        
+        return results
 
 semantic_search_service = SemanticSearchService() 
@@ -1,4 +1,9 @@
+import asyncio
+import datetime as dt
 import logging
+from typing import Dict, List
+
+from telegram.error import RetryAfter
 from telegram.ext import ExtBot
 
 from models.news import NewsItem
@@ -7,6 +12,14 @@ from core.config import settings
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Maps each Markdown special character to its escaped form
+_MD_TABLE = str.maketrans({char: f"\\{char}" for char in "_*[]()~`>#+-=|{}.!"})
+
+
+def escape_markdown(text: str) -> str:
+    """Escape Telegram Markdown special characters in one pass."""
+    return text.translate(_MD_TABLE)
+
 
 class TelegramBot:
     def __init__(self, token: str | None = None, chat_id: str | None = None):
@@ -17,6 +30,8 @@ class TelegramBot:
         self.token = token or settings.telegram_bot_token
         self.chat_id = chat_id or settings.telegram_chat_id
         self.bot = ExtBot(token=self.token)
+        # Formatted messages by article id, for as many articles as are stored
+        self._messages: Dict[str, str] = {}
     
     async def send_news(self, news_item: NewsItem):
         """Send a news item to Telegram."""
@@ -39,13 +54,59 @@ class TelegramBot:
                     parse_mode='Markdown'
                 )
     
+    async def send_news_batch(self, news_items: List[NewsItem]) -> list:
+        """
+        Send several news items to Telegram, in the order given.
+        
+        All messages go to one chat, which Telegram rate-limits, so they are
+        sent one at a time, TELEGRAM_MESSAGE_INTERVAL_SECONDS apart. When
+        Telegram asks to slow down, the send is retried after the requested
+        wait, up to TELEGRAM_MAX_SEND_RETRIES times. A failed send does not
+        stop the others; it is logged and its exception returned in place
+        of the result.
+        """
+        results = []
+        async with self.bot:
+            for i, news_item in enumerate(news_items):
+                if i:
+                    await asyncio.sleep(settings.TELEGRAM_MESSAGE_INTERVAL_SECONDS)
+                try:
+                    result = await self._send_with_retry(self._format_message(news_item))
+                    logger.info(f"Sent news: {news_item.title}")
+                except Exception as e:
+                    logger.error(f"Failed to send {news_item.title}: {str(e)}")
+                    result = e
+                results.append(result)
+        return results
+    
+    async def _send_with_retry(self, message: str):
+        """Send a message, waiting out Telegram's flood control when asked to."""
+        for attempt in range(settings.TELEGRAM_MAX_SEND_RETRIES + 1):
+            try:
+                return await self.bot.send_message(
+                    chat_id=self.chat_id,
+                    text=message,
+                    parse_mode='Markdown'
+                )
+            except RetryAfter as e:
+                if attempt == settings.TELEGRAM_MAX_SEND_RETRIES:
+                    raise
+                retry_after = e.retry_after
+                if isinstance(retry_after, dt.timedelta):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(f"Rate limited by Telegram, retrying in {retry_after}s")
+                await asyncio.sleep(retry_after)
+    
     def _format_message(self, news_item: NewsItem) -> str:
-        """Format the news item as a message with Markdown."""
-        def escape_markdown(text: str) -> str:
-            special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-            for char in special_chars:
-                text = text.replace(char, f'\\{char}')
-            return text
+        """
+        Format the news item as a message with Markdown.
+        
+        Articles do not change once fetched, so each article's message is
+        built once and reused for later sends.
+        """
+        message = self._messages.get(news_item.id)
+        if message is not None:
+            return message
         
         title = escape_markdown(news_item.title) if news_item.title else "No Title"
         date = news_item.published.strftime(settings.TELEGRAM_DATE_FORMAT) if news_item.published else "Unknown date"
@@ -53,13 +114,18 @@ class TelegramBot:
         source = escape_markdown(news_item.source) if news_item.source else "Source unknown"
         url = news_item.url if news_item.url else ""
         
-        message = (
-            f"{settings.TELEGRAM_MESSAGE_TEMPLATE['TITLE'].format(title=title)}\n"
-            f"{settings.TELEGRAM_MESSAGE_TEMPLATE['DATE'].format(date=date)}\n\n"
-            f"{settings.TELEGRAM_MESSAGE_TEMPLATE['SUMMARY'].format(summary=summary)}\n\n"
-            f"{settings.TELEGRAM_MESSAGE_TEMPLATE['SOURCE'].format(source=source)}\n"
-            f"{settings.TELEGRAM_MESSAGE_TEMPLATE['LINK'].format(url=url)}"
+        message = settings.TELEGRAM_MESSAGE_TEMPLATE.format(
+            title=title,
+            date=date,
+            summary=summary,
+            source=source,
+            url=url
         )
+        
+        self._messages[news_item.id] = message
+        if len(self._messages) > settings.MAX_STORED_ARTICLES:
+            # Dicts keep insertion order; drop the oldest message
+            del self._messages[next(iter(self._messages))]
         return message
 
 telegram_bot = TelegramBot()
@@ -0,0 +1,18 @@
+import pytest
+
+from core.config import settings
+from services.embedding_cache import EmbeddingCache
+
+@pytest.fixture(autouse=True)
+def embedding_cache(monkeypatch):
+    """Give each test an empty article embedding cache so cached vectors never leak between tests."""
+    cache = EmbeddingCache(max_size=settings.EMBEDDING_CACHE_SIZE)
+    monkeypatch.setattr("services.rss_fetcher.embedding_cache", cache)
+    return cache
+
+@pytest.fixture(autouse=True)
+def query_embedding_cache(monkeypatch):
+    """Give each test an empty query embedding cache."""
+    cache = EmbeddingCache(max_size=settings.QUERY_EMBEDDING_CACHE_SIZE)
+    monkeypatch.setattr("services.semantic_search.query_embedding_cache", cache)
+    return cache
@@ -0,0 +1,27 @@
+import numpy as np
+
+from services.embedding_cache import EmbeddingCache
+
+def test_get_and_put():
+    """Test embeddings are returned for the exact text they were cached under."""
+    cache = EmbeddingCache(max_size=2)
+    embedding = np.ones(4, dtype=np.float32)
+
+    assert cache.get("Gaza") is None
+    cache.put("Gaza", embedding)
+    assert cache.get("Gaza") is embedding
+    assert cache.get("gaza") is None
+
+def test_least_recently_used_evicted():
+    """Test the least recently used entry is dropped when the cache is full."""
+    cache = EmbeddingCache(max_size=2)
+    for text in ("first", "second"):
+        cache.put(text, np.zeros(4, dtype=np.float32))
+
+    cache.get("first")
+    cache.put("third", np.zeros(4, dtype=np.float32))
+
+    assert len(cache) == 2
+    assert cache.get("second") is None
+    assert cache.get("first") is not None
+    assert cache.get("third") is not None
@@ -1,11 +1,16 @@
 import asyncio
+import base64
 import datetime as dt
+import numpy as np
+import orjson
 import pytest
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, PropertyMock, patch
 
 from core.config import settings
 from models.news import NewsItem
+from models.semantic_search import MatchConfidence
 from services.news_service import NewsService
+from services.semantic_search import EmbeddingIndex, SemanticSearchService
 
 @pytest.fixture
 def news_service():
@@ -47,7 +52,7 @@ def test_get_all_news(news_service, sample_articles):
     """Test retrieving all news articles."""
     # Add sample articles
     for article in sample_articles:
-        news_service.news_store.append(article)
+        news_service.add_item(article)
     
     # Get all articles
     articles = news_service.get_all_news()
@@ -61,7 +66,7 @@ def test_get_latest_news(news_service, sample_articles):
     """Test retrieving latest N news articles."""
     # Add sample articles
     for article in sample_articles:
-        news_service.news_store.append(article)
+        news_service.add_item(article)
     
     # Test with default count
     latest = news_service.get_latest_news()
@@ -74,11 +79,39 @@ def test_get_latest_news(news_service, sample_articles):
     assert latest[0].id == "1"
     assert latest[1].id == "2"
 
+def test_news_payloads(news_service, sample_articles):
+    """Test serialized payloads for the article list endpoints."""
+    for article in sample_articles[:2]:
+        news_service.add_item(article)
+    assert orjson.loads(news_service.get_all_news_payload())["total_articles"] == 2
+    
+    # Adding an article outside the poller invalidates cached payloads
+    news_service.add_item(sample_articles[2])
+    payload = orjson.loads(news_service.get_all_news_payload())
+    assert payload["total_articles"] == 3
+    assert [a["id"] for a in payload["articles"]] == ["1", "2", "3"]
+    
+    payload = orjson.loads(news_service.get_latest_news_payload(2))
+    assert payload["requested_count"] == 2
+    assert payload["returned_count"] == 2
+    assert [a["id"] for a in payload["articles"]] == ["1", "2"]
+
+def test_to_dict_embedding(sample_articles):
+    """Test embeddings are omitted by default and base64-encoded on request."""
+    article = sample_articles[0]
+    article.embedding = np.arange(4, dtype=np.float32)
+    
+    assert "embedding" not in article.to_dict()
+    
+    encoded = article.to_dict(include_embedding=True)["embedding"]
+    decoded = np.frombuffer(base64.b64decode(encoded), dtype=np.float32)
+    assert np.array_equal(decoded, article.embedding)
+
 def test_search_news(news_service, sample_articles):
     """Test searching news articles by keyword."""
     # Add sample articles
     for article in sample_articles:
-        news_service.news_store.append(article)
+        news_service.add_item(article)
     
     # Search in title
     results = news_service.search_news("Special")
@@ -90,19 +123,155 @@ def test_search_news(news_service, sample_articles):
     assert len(results) == 1
     assert results[0].id == "3"
     
+    # Search for part of a word
+    results = news_service.search_news("artic")
+    assert len(results) == 3
+    assert [item.id for item in results] == ["1", "2", "3"]
+    
+    # Search with a keyword shorter than a trigram
+    results = news_service.search_news("IR")
+    assert [item.id for item in results] == ["1", "3"]
+    
     # Search with no matches
     results = news_service.search_news("nonexistent")
     assert len(results) == 0
 
+def test_add_item_evicts_oldest(sample_articles):
+    """Test that evicted articles are dropped from the search index."""
+    news_service = NewsService(max_articles=2)
+    for article in reversed(sample_articles):
+        news_service.add_item(article)
+    
+    assert [item.id for item in news_service.get_all_news()] == ["1", "2"]
+    assert "3" not in news_service.news_by_id
+    assert news_service.search_news("Special") == []
+    assert [item.id for item in news_service.search_news("article")] == ["1", "2"]
+    
+    # Older than everything in a full store
+    news_service.add_item(sample_articles[2])
+    assert [item.id for item in news_service.get_all_news()] == ["1", "2"]
+
+def test_store_sorted_on_insert(news_service, sample_articles):
+    """Test the store stays sorted newest first regardless of insertion order."""
+    for article in (sample_articles[1], sample_articles[2], sample_articles[0]):
+        news_service.add_item(article)
+    
+    assert [item.id for item in news_service.news_store] == ["1", "2", "3"]
+    
+    # Adding an article twice keeps a single copy
+    news_service.add_item(sample_articles[0])
+    assert len(news_service.news_store) == 3
+
+@pytest.mark.parametrize("quantized", [False, True])
+def test_semantic_search(news_service, sample_articles, quantized):
+    """Test semantic search over float32 and int8 article embeddings."""
+    news_service.embedding_index = EmbeddingIndex(
+        capacity=settings.MAX_STORED_ARTICLES,
+        dimension=settings.EMBEDDING_DIMENSION,
+        quantized=quantized
+    )
+    vectors = np.eye(len(sample_articles), settings.EMBEDDING_DIMENSION, dtype=np.float32)
+    for article, vector in zip(sample_articles, vectors):
+        article.embedding = vector
+        news_service.add_item(article)
+    
+    with patch.object(type(settings), "model", new_callable=PropertyMock) as mock_model:
+        mock_model.return_value.encode.return_value = vectors[1] + 0.5 * vectors[2]
+        results = news_service.semantic_search("unrelated query", min_threshold=0.4)
+        top_result = news_service.semantic_search("unrelated query", min_threshold=0.4, max_results=1)
+        no_results = news_service.semantic_search("unrelated query", min_threshold=0.95)
+    
+    assert [result.news_item.id for result in top_result] == ["2"]
+    assert no_results == []
+    assert [result.news_item.id for result in results] == ["2", "3"]
+    assert results[0].similarity_score == pytest.approx(2 / np.sqrt(5), abs=1e-2)
+    assert results[1].similarity_score == pytest.approx(1 / np.sqrt(5), abs=1e-2)
+    assert results[0].confidence == MatchConfidence.VERY_STRONG
+    assert results[1].confidence == MatchConfidence.WEAK
+
+def test_semantic_search_exact_match_boost(news_service, sample_articles):
+    """Test query words found in an article raise its score."""
+    vectors = np.eye(len(sample_articles), settings.EMBEDDING_DIMENSION, dtype=np.float32)
+    for article, vector in zip(sample_articles, vectors):
+        article.embedding = vector
+        news_service.add_item(article)
+    
+    with patch.object(type(settings), "model", new_callable=PropertyMock) as mock_model:
+        mock_model.return_value.encode.return_value = vectors[1]
+        results = news_service.semantic_search("Special keyword", min_threshold=0.2)
+    
+    assert [result.news_item.id for result in results] == ["2", "3"]
+    # Both words in the title, one of two in the summary
+    expected = 1.0 * SemanticSearchService.TITLE_WEIGHT + 0.5 * SemanticSearchService.SUMMARY_WEIGHT
+    assert results[1].similarity_score == pytest.approx(expected * SemanticSearchService.EXACT_MATCH_BOOST, abs=1e-2)
+
+def test_semantic_search_caches_query_embedding(news_service):
+    """Test a repeated query is only encoded once."""
+    with patch.object(type(settings), "model", new_callable=PropertyMock) as mock_model:
+        mock_model.return_value.encode.return_value = np.ones(settings.EMBEDDING_DIMENSION, dtype=np.float32)
+        news_service.semantic_search("repeated query")
+        news_service.semantic_search("repeated query")
+    
+    mock_model.return_value.encode.assert_called_once_with("repeated query")
+
+def test_query_embeddings_cannot_evict_articles(news_service, embedding_cache, query_embedding_cache):
+    """Test query traffic only fills the query cache."""
+    article_embedding = np.ones(settings.EMBEDDING_DIMENSION, dtype=np.float32)
+    embedding_cache.put("article text", article_embedding)
+    query_embedding_cache.max_size = 2
+    
+    with patch.object(type(settings), "model", new_callable=PropertyMock) as mock_model:
+        mock_model.return_value.encode.return_value = np.ones(settings.EMBEDDING_DIMENSION, dtype=np.float32)
+        for i in range(5):
+            news_service.semantic_search(f"unique query {i}")
+    
+    assert len(query_embedding_cache) == 2
+    assert len(embedding_cache) == 1
+    assert embedding_cache.get("article text") is article_embedding
+
+def test_quantized_index_drops_float_embedding(sample_articles):
+    """Test int8 storage keeps only the codes, not the float32 vector."""
+    index = EmbeddingIndex(capacity=4, dimension=settings.EMBEDDING_DIMENSION, quantized=True)
+    article = sample_articles[0]
+    vector = np.eye(1, settings.EMBEDDING_DIMENSION, dtype=np.float32)[0]
+    article.embedding = vector
+    index.add(article)
+    
+    assert article.embedding is None
+    assert article.embedding_codes.dtype == np.int8
+    assert np.shares_memory(article.embedding_codes, index._codes)
+    
+    encoded = article.to_dict(include_embedding=True)["embedding"]
+    decoded = np.frombuffer(base64.b64decode(encoded), dtype=np.float32)
+    assert np.allclose(decoded, vector, atol=1e-2)
+    
+    index.remove(article)
+    assert not np.shares_memory(article.embedding_codes, index._codes)
+
+def test_embedding_rows_reused_on_eviction(sample_articles):
+    """Test evicted articles free their embedding row for new articles."""
+    news_service = NewsService(max_articles=2)
+    vectors = np.eye(len(sample_articles), settings.EMBEDDING_DIMENSION, dtype=np.float32)
+    for article, vector in reversed(list(zip(sample_articles, vectors))):
+        article.embedding = vector
+        news_service.add_item(article)
+    
+    # The oldest article was evicted and its row now holds the newest one
+    assert [item.id for item in news_service.embedding_index.items] == ["1", "2"]
+    assert np.array_equal(sample_articles[2].embedding, vectors[2])
+    assert np.array_equal(sample_articles[0].embedding, vectors[0])
+    assert np.shares_memory(sample_articles[0].embedding, news_service.embedding_index._vectors)
+    assert not np.shares_memory(sample_articles[2].embedding, news_service.embedding_index._vectors)
+
 def test_get_feed_status(news_service, sample_articles):
     """Test getting feed status information."""
     # Add sample articles and setup state
     for article in sample_articles:
-        news_service.news_store.append(article)
+        news_service.add_item(article)
     
     news_service.feed_state.latest_hash = "test_hash"
     news_service.feed_state.last_fetch_time = dt.datetime.now(dt.timezone.utc)
-    news_service.feed_state.seen_ids.update(["1", "2", "3"])
+    news_service.feed_state.seen_ids.update([1, 2, 3])
     
     status = news_service.get_feed_status()
     
@@ -124,10 +293,12 @@ async def test_polling_lifecycle(news_service):
     # Stop polling
     await news_service.stop_polling()
     assert news_service._polling_task.done()
+    assert news_service._client is None
     
-    # Start polling again
+    # Start polling again with a fresh HTTP client
     await news_service.start_polling()
     assert not news_service._polling_task.done()
+    assert not news_service._client.is_closed
     await news_service.stop_polling()
 
 @pytest.mark.asyncio
@@ -148,4 +319,25 @@ async def test_rss_poller_error_handling(news_service):
         
         # Verify service remains operational
         assert len(news_service.news_store) == 0
-        assert news_service.get_feed_status()["polling_active"] is False 
\ No newline at end of file
+        assert news_service.get_feed_status()["polling_active"] is False
+
+@pytest.mark.asyncio
+async def test_cached_payload(news_service):
+    """Test payloads are built once per poll cycle."""
+    calls = []
+    
+    def build():
+        calls.append(1)
+        return {"count": len(calls)}
+    
+    assert news_service.cached_payload("key", build) == b'{"count":1}'
+    assert news_service.cached_payload("key", build) == b'{"count":1}'
+    assert len(calls) == 1
+    
+    # Starting and stopping the poller drops cached payloads
+    with patch('services.news_service.fetch_feed', new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.return_value = []
+        await news_service.start_polling()
+        await news_service.stop_polling()
+    
+    assert news_service.cached_payload("key", build) == b'{"count":2}'
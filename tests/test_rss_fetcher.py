@@ -1,11 +1,14 @@
 import datetime as dt
+import httpx
+import numpy as np
 import pytest
+import pytest_asyncio
 import respx
 from httpx import Response
 
 from core.config import settings
 from models.news import FeedState, NewsItem
-from services.rss_fetcher import fetch_feed, generate_latest_hash
+from services.rss_fetcher import fetch_feed, generate_guid_key, generate_latest_hash, parse_feed
 
 # Sample RSS feed response for testing
 SAMPLE_RSS = """<?xml version="1.0" encoding="UTF-8"?>
@@ -32,13 +35,32 @@ SAMPLE_RSS = """<?xml version="1.0" encoding="UTF-8"?>
     </channel>
 </rss>"""
 
+SAMPLE_ATOM = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+    <title>Atom News</title>
+    <entry>
+        <title>Atom Article</title>
+        <summary>Summary of atom article</summary>
+        <link href="https://example.com/atom1"/>
+        <id>atom1-guid</id>
+        <updated>2024-03-13T12:00:00Z</updated>
+        <published>2024-03-13T12:00:00Z</published>
+    </entry>
+</feed>"""
+
 @pytest.fixture
 def feed_state():
     """Create a fresh FeedState instance for each test."""
     return FeedState()
 
+@pytest_asyncio.fixture
+async def client():
+    """Create an HTTP client for each test."""
+    async with httpx.AsyncClient() as client:
+        yield client
+
 @pytest.mark.asyncio
-async def test_fetch_feed_success(feed_state):
+async def test_fetch_feed_success(feed_state, client):
     """Test successful RSS feed fetch with new articles."""
     with respx.mock:
         # Mock the RSS feed endpoint
@@ -47,7 +69,7 @@ async def test_fetch_feed_success(feed_state):
         )
         
         # Fetch feed
-        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state)
+        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
         
         # Verify results
         assert len(articles) == 2
@@ -56,46 +78,75 @@ async def test_fetch_feed_success(feed_state):
         assert articles[0].id == "article1-guid"
         assert articles[1].title == "Test Article 2"
         assert articles[1].id == "article2-guid"
+        assert articles[0].published == dt.datetime(2024, 3, 13, 12, tzinfo=dt.timezone.utc)
+        
+        # Verify embeddings are normalized
+        for article in articles:
+            assert article.embedding.shape == (settings.EMBEDDING_DIMENSION,)
+            assert np.linalg.norm(article.embedding) == pytest.approx(1.0, abs=1e-5)
         
         # Verify state updates
-        assert len(feed_state.seen_ids) == 2
+        assert feed_state.seen_ids == {
+            generate_guid_key("article1-guid"),
+            generate_guid_key("article2-guid")
+        }
         assert feed_state.latest_hash is not None
         assert feed_state.last_fetch_time is not None
 
 @pytest.mark.asyncio
-async def test_fetch_feed_no_changes(feed_state):
+async def test_fetch_feed_no_changes(feed_state, client):
     """Test feed fetch when content hasn't changed."""
     with respx.mock:
         # First fetch to populate state
         respx.get(settings.BBC_MIDDLE_EAST_RSS).mock(
             return_value=Response(200, text=SAMPLE_RSS)
         )
-        await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state)
+        await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
         
         # Second fetch with same content
-        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state)
+        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
         assert len(articles) == 0  # No new articles
 
 @pytest.mark.asyncio
-async def test_fetch_feed_error_handling(feed_state):
+async def test_fetch_feed_not_modified(feed_state, client):
+    """Test validators are sent back and a 304 yields no articles."""
+    with respx.mock:
+        route = respx.get(settings.BBC_MIDDLE_EAST_RSS).mock(
+            return_value=Response(
+                200,
+                text=SAMPLE_RSS,
+                headers={"ETag": '"v1"', "Last-Modified": "Wed, 13 Mar 2024 12:00:00 GMT"}
+            )
+        )
+        await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
+        assert feed_state.etag == '"v1"'
+        
+        route.mock(return_value=Response(304))
+        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
+        assert articles == []
+        assert route.calls.last.request.headers["If-None-Match"] == '"v1"'
+        assert route.calls.last.request.headers["If-Modified-Since"] == "Wed, 13 Mar 2024 12:00:00 GMT"
+
+@pytest.mark.asyncio
+async def test_fetch_feed_error_handling(feed_state, client):
     """Test error handling for various HTTP errors."""
     with respx.mock:
         # Test 404 response
         respx.get(settings.BBC_MIDDLE_EAST_RSS).mock(
             return_value=Response(404)
         )
-        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state)
+        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
         assert articles == []
         
         # Test timeout
         respx.get(settings.BBC_MIDDLE_EAST_RSS).mock(
             side_effect=TimeoutError
         )
-        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state)
+        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
         assert articles == []
 
 @pytest.mark.asyncio
-async def test_fetch_feed_invalid_date(feed_state):
+async def test_fetch_feed_invalid_date(feed_state, client):
     """Test handling of invalid publication dates."""
     invalid_date_rss = SAMPLE_RSS.replace(
         "Wed, 13 Mar 2024 12:00:00 GMT",
@@ -107,21 +158,76 @@ async def test_fetch_feed_invalid_date(feed_state):
             return_value=Response(200, text=invalid_date_rss)
         )
         
-        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state)
+        articles = await fetch_feed(settings.BBC_MIDDLE_EAST_RSS, feed_state, client)
         assert len(articles) == 2
         # Should use current time as fallback
         assert isinstance(articles[0].published, dt.datetime)
 
+PADDED_RSS = (
+    SAMPLE_RSS
+    .replace("<title>Test Article 1</title>", "<title>\n   Padded title\n</title>")
+    .replace("<link>https://www.bbc.co.uk/news/article1</link>", "<link> https://e.com/a </link>")
+    .replace("<title>BBC News - Middle East</title>", "<title> Chan </title>")
+)
+HTML_RSS = SAMPLE_RSS.replace(
+    "<description>Summary of test article 1</description>",
+    "<description>&lt;p onclick=\"x()\"&gt;Hi&lt;/p&gt;&lt;script&gt;alert(1)&lt;/script&gt;</description>"
+)
+GUID_LINK_RSS = SAMPLE_RSS.replace(
+    "<link>https://www.bbc.co.uk/news/article2</link>", ""
+).replace("<guid>article2-guid</guid>", "<guid>https://www.bbc.co.uk/news/article2</guid>")
+
+@pytest.mark.parametrize("rss", [SAMPLE_RSS, PADDED_RSS, HTML_RSS, GUID_LINK_RSS])
+def test_parse_feed_matches_feedparser(feed_state, rss):
+    """Test RSS parsed directly matches what feedparser extracts."""
+    import feedparser
+    
+    articles = parse_feed(rss.encode(), feed_state)
+    feed = feedparser.parse(rss)
+    entries = feed.entries
+    
+    assert [a.id for a in articles] == [e.id for e in entries]
+    assert [a.title for a in articles] == [e.title for e in entries]
+    assert [a.url for a in articles] == [e.get("link") for e in entries]
+    assert [a.summary for a in articles] == [e.summary for e in entries]
+    assert all(a.source == feed.feed.title for a in articles)
+    assert feed_state.latest_hash == generate_latest_hash(entries)
+    assert "<script>" not in articles[0].summary
+
+def test_parse_feed_atom_fallback(feed_state):
+    """Test non-RSS feeds are still parsed through feedparser."""
+    articles = parse_feed(SAMPLE_ATOM.encode(), feed_state)
+    
+    assert len(articles) == 1
+    assert articles[0].id == "atom1-guid"
+    assert articles[0].url == "https://example.com/atom1"
+    assert articles[0].source == "Atom News"
+    assert articles[0].published == dt.datetime(2024, 3, 13, 12, tzinfo=dt.timezone.utc)
+
+def test_parse_feed_guid_fallback(feed_state):
+    """Test entries without a guid are identified by their link."""
+    no_guid_rss = SAMPLE_RSS.replace("<guid>article1-guid</guid>", "")
+    
+    articles = parse_feed(no_guid_rss.encode(), feed_state)
+    assert [a.id for a in articles] == ["https://www.bbc.co.uk/news/article1", "article2-guid"]
+
 def test_generate_latest_hash():
     """Test hash generation for feed content."""
     import feedparser
     
     # Test with empty feed
     empty_feed = feedparser.parse("")
-    assert generate_latest_hash(empty_feed) == ""
+    assert generate_latest_hash(empty_feed.entries) == ""
     
     # Test with sample feed
     feed = feedparser.parse(SAMPLE_RSS)
-    hash1 = generate_latest_hash(feed)
+    hash1 = generate_latest_hash(feed.entries)
     assert isinstance(hash1, str)
-    assert len(hash1) == 40  # SHA-1 hash length 
\ No newline at end of file
+    assert len(hash1) == 40  # 20-byte BLAKE2b digest
+
+def test_generate_guid_key():
+    """Test seen-ID keys are stable 64-bit integers."""
+    key = generate_guid_key("article1-guid")
+    assert key == generate_guid_key("article1-guid")
+    assert key != generate_guid_key("article2-guid")
+    assert 0 <= key < 2 ** 64
@@ -0,0 +1,62 @@
+import datetime as dt
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram.error import RetryAfter
+
+from core.config import settings
+from models.news import NewsItem
+from services.telegram_service import TelegramBot
+
+@pytest.fixture
+def telegram_bot():
+    """Create a TelegramBot whose underlying ExtBot is mocked."""
+    bot = TelegramBot(token="token", chat_id="chat")
+    bot.bot = MagicMock()
+    bot.bot.send_message = AsyncMock()
+    return bot
+
+@pytest.fixture
+def news_items():
+    """Create a list of news items to send."""
+    now = dt.datetime.now(dt.timezone.utc)
+    return [
+        NewsItem(id=str(i), title=f"Article {i}", published=now - dt.timedelta(hours=i))
+        for i in range(3)
+    ]
+
+@pytest.mark.asyncio
+async def test_send_news_batch(telegram_bot, news_items):
+    """Test messages are sent in order, retried when rate limited, and failures kept."""
+    failure = Exception("Bad Request")
+    telegram_bot.bot.send_message.side_effect = [RetryAfter(0), "sent 0", failure, "sent 2"]
+    
+    with patch.object(settings, "TELEGRAM_MESSAGE_INTERVAL_SECONDS", 0):
+        results = await telegram_bot.send_news_batch(news_items)
+    
+    assert results == ["sent 0", failure, "sent 2"]
+    sent_texts = [call.kwargs["text"] for call in telegram_bot.bot.send_message.call_args_list]
+    assert [text.splitlines()[0] for text in sent_texts] == [
+        "*Article 0*", "*Article 0*", "*Article 1*", "*Article 2*"
+    ]
+    assert all(call.kwargs["chat_id"] == "chat" for call in telegram_bot.bot.send_message.call_args_list)
+
+@pytest.mark.asyncio
+async def test_send_news_batch_gives_up_after_retries(telegram_bot, news_items):
+    """Test a message that stays rate limited is reported as failed."""
+    telegram_bot.bot.send_message.side_effect = RetryAfter(0)
+    
+    results = await telegram_bot.send_news_batch(news_items[:1])
+    
+    assert isinstance(results[0], RetryAfter)
+    assert telegram_bot.bot.send_message.await_count == settings.TELEGRAM_MAX_SEND_RETRIES + 1
+
+def test_format_message_cached_by_id(telegram_bot, news_items):
+    """Test each article's message is built once and the cache stays bounded."""
+    message = telegram_bot._format_message(news_items[0])
+    assert telegram_bot._format_message(news_items[0]) is message
+    
+    with patch.object(settings, "MAX_STORED_ARTICLES", 2):
+        for news_item in news_items:
+            telegram_bot._format_message(news_item)
+    assert list(telegram_bot._messages) == ["1", "2"]